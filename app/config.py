@@ -1,3 +1,5 @@
+from functools import lru_cache
+from pydantic import field_validator
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -11,16 +13,50 @@ class Settings(BaseSettings):
     REDIS_PASSWORD: str = ""
     CACHE_EXPIRATION_SECONDS: int = 300
 
+    # Per data class cache TTLs: price/volume changes constantly, supply rarely
+    PRICE_CACHE_EXPIRATION_SECONDS: int = 30
+    PRICE_CACHE_SOFT_EXPIRATION_SECONDS: int = 20
+    SUPPLY_CACHE_EXPIRATION_SECONDS: int = 600
+    SUPPLY_CACHE_SOFT_EXPIRATION_SECONDS: int = 480
+    # How often the background refresher checks for stale data
+    CACHE_REFRESH_INTERVAL_SECONDS: int = 10
+
+    # Uvicorn worker processes. Fixed default because os.cpu_count() ignores
+    # container CPU quotas; override via the WEB_CONCURRENCY env var.
+    WEB_CONCURRENCY: int = 5
+
     HELIUS_API_URL: str = "https://api.helius.xyz"
     TOKEN_ADDRESS: str = ""
     
     # Additional fields that might be in environment
-    MORALIS_URL: str = "https://solana-gateway.moralis.io/token/mainnet/holders/"
+    MORALIS_URL: str = "https://solana-gateway.moralis.io"
     BIRDEYE_URL: str = "https://public-api.birdeye.so/public/token/market-data?address="
 
+    @field_validator("MORALIS_URL", "HELIUS_API_URL")
+    @classmethod
+    def strip_trailing_slash(cls, value: str) -> str:
+        """Base URLs are joined with paths starting with '/'"""
+        return value.rstrip("/")
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
         extra = "ignore"  # Ignore extra fields
 
-settings = Settings()
\ No newline at end of file
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Load settings once per process; call get_settings.cache_clear() to reload"""
+    return Settings()
+
+class _SettingsProxy:
+    """
+    Lazy stand-in for the Settings instance: every attribute read goes through
+    get_settings(), so settings are loaded on first use and a cache_clear() is
+    picked up by all modules. Values captured at import time (e.g. the Redis
+    connection pool) are not affected by a reload.
+    """
+
+    def __getattr__(self, name: str):
+        return getattr(get_settings(), name)
+
+settings = _SettingsProxy()
@@ -1,3 +1,5 @@
+import asyncio
+from contextlib import suppress
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
@@ -5,7 +7,9 @@ from fastapi.responses import FileResponse
 import uvicorn
 from app.config import settings
 from app.routes.stats import router as stats_router
-from app.services.cache_manager import tokenomics_cache
+from app.services.aggregator import get_cache_performance, run_refresher
+from app.services.http import init_http_client, close_http_client
+from app.services.redis import init_redis, close_redis
 
 app = FastAPI(title="Crypto Coin App", description="A FastAPI application for crypto coin stats")
 
@@ -26,6 +30,20 @@ app.add_middleware(
 # Mount static files
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
 
+@app.on_event("startup")
+async def startup():
+    await init_http_client()
+    await init_redis()
+    app.state.refresher = asyncio.create_task(run_refresher())
+
+@app.on_event("shutdown")
+async def shutdown():
+    app.state.refresher.cancel()
+    with suppress(asyncio.CancelledError):
+        await app.state.refresher
+    await close_http_client()
+    await close_redis()
+
 # Include routes
 app.include_router(stats_router, prefix="/api/v1", tags=["crypto"])
 
@@ -38,14 +56,25 @@ def health_check():
     return {"status": "ok", "message": "Crypto API is running"}
 
 @app.get("/cache/status")
-def cache_status():
+async def cache_status():
     """Get Redis cache status and performance metrics"""
-    return tokenomics_cache.get_cache_performance(settings.TOKEN_ADDRESS)
+    return await get_cache_performance()
 
 @app.get("/cache/performance")
 async def cache_performance():
     """Get detailed cache performance metrics including hit rates"""
-    return await tokenomics_cache.get_cache_performance(settings.TOKEN_ADDRESS)
+    return await get_cache_performance()
+
+def main():
+    """Run the app under uvicorn with uvloop, httptools and multiple workers"""
+    uvicorn.run(
+        "app.main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        workers=settings.WEB_CONCURRENCY,
+    )
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    main()
\ No newline at end of file
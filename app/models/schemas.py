@@ -1,7 +1,8 @@
 from pydantic import BaseModel
+from dataclasses import dataclass, field
 from datetime import datetime
 from decimal import Decimal
-from typing import Any
+from typing import Any, Dict, Optional
 
 class CoinData(BaseModel):
     token_address: str
@@ -24,3 +25,24 @@ class CoinData(BaseModel):
 class SuccessResponse(BaseModel):
     message: str
     data: Any
+
+
+@dataclass(slots=True)
+class Tokenomics:
+    """Aggregated token data; defaults are the fallback values used when an API fails"""
+    # Moralis (price data)
+    token_name: Optional[str] = "Unknown Token"
+    token_symbol: Optional[str] = "UNKNOWN"
+    price_usd: Optional[float] = 0.0
+    price_change_percentage_24h: Optional[float] = 0.0
+    volume_24h: Optional[float] = 0.0
+
+    # Birdeye (supply data)
+    market_cap: Optional[float] = 0.0
+    total_supply: Optional[float] = 0.0
+    circulating_supply: Optional[float] = 0.0
+
+    # Metadata
+    data_sources: Dict[str, str] = field(default_factory=dict)
+    cache_info: Dict[str, Any] = field(default_factory=dict)
+    response_time: float = 0.0
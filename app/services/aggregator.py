@@ -1,13 +1,43 @@
 import asyncio
 import time
+from dataclasses import asdict
 from datetime import datetime
 from app.services.moralis import fetch_token_details
 from app.services.birdeye import fetch_token_stats
 from app.utils.format import to_fixed_str, format_to_millions
 from app.services.cache_manager import tokenomics_cache
+from app.models.schemas import Tokenomics
 from app.config import settings
 from loguru import logger
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Set, Tuple
+
+# Data classes cached under separate keys so each gets a TTL matching how fast it
+# changes: price/volume (Moralis) moves constantly, supply (Birdeye) barely moves.
+DATA_CLASSES: Dict[str, Dict[str, Any]] = {
+    "price": {
+        "api_func": fetch_token_details,
+        "api_name": "Moralis",
+        "source": "moralis",
+        "fields": ("token_name", "token_symbol", "price_usd", "price_change_percentage_24h", "volume_24h"),
+        # Names of the settings holding the hard and soft cache expiration
+        "expiration_setting": "PRICE_CACHE_EXPIRATION_SECONDS",
+        "soft_expiration_setting": "PRICE_CACHE_SOFT_EXPIRATION_SECONDS",
+    },
+    "supply": {
+        "api_func": fetch_token_stats,
+        "api_name": "Birdeye",
+        "source": "birdeye",
+        "fields": ("market_cap", "total_supply", "circulating_supply"),
+        "expiration_setting": "SUPPLY_CACHE_EXPIRATION_SECONDS",
+        "soft_expiration_setting": "SUPPLY_CACHE_SOFT_EXPIRATION_SECONDS",
+    },
+}
+
+# In-flight upstream fetches keyed by (token address, data class)
+_inflight: Dict[Tuple[str, str], asyncio.Task] = {}
+
+# Stale refreshes waiting on the cross-worker refresh lock, keyed like _inflight
+_pending_refreshes: Set[Tuple[str, str]] = set()
 
 async def fetch_with_fallback(api_func, api_name: str) -> Optional[Dict[str, Any]]:
     """
@@ -32,105 +62,197 @@ async def fetch_with_fallback(api_func, api_name: str) -> Optional[Dict[str, Any
         logger.error(f"Failed to fetch data from {api_name} after {response_time:.3f}s: {str(e)}")
         return None
 
+def _cache_ttls(data_class: str) -> Tuple[int, int]:
+    """Return the (hard, soft) cache expiration in seconds for a data class"""
+    config = DATA_CLASSES[data_class]
+    return getattr(settings, config["expiration_setting"]), getattr(settings, config["soft_expiration_setting"])
+
+async def fetch_and_cache_tokenomics(token_address: str, data_class: str) -> Optional[Dict[str, Any]]:
+    """
+    Fetch fresh data for one data class from its upstream API and store it in the cache.
+    
+    Args:
+        token_address: Token address used as the cache identifier
+        data_class: Key of DATA_CLASSES to fetch ("price" or "supply")
+    
+    Returns:
+        Cached payload (API data plus cache_info), the bare API data if caching failed,
+        or None if the API failed
+    """
+    config = DATA_CLASSES[data_class]
+    data = await fetch_with_fallback(config["api_func"], config["api_name"])
+    
+    if not data:
+        logger.warning(f"No {data_class} data available from {config['api_name']}, not caching")
+        return None
+    
+    expiration, soft_expiration = _cache_ttls(data_class)
+    payload = await tokenomics_cache.set_cached_data(
+        token_address,
+        data,
+        expiration=expiration,
+        soft_expiration=soft_expiration,
+        field=data_class
+    )
+    if payload is None:
+        logger.warning(f"Failed to cache {data_class} data")
+        return data
+    
+    return payload
+
+def _start_fetch(token_address: str, data_class: str) -> asyncio.Task:
+    """
+    Start an upstream fetch for a token's data class, or join the one already in flight.
+    
+    Concurrent cache misses share a single fetch instead of each calling
+    the upstream API (single-flight).
+    """
+    key = (token_address, data_class)
+    task = _inflight.get(key)
+    if task is not None:
+        logger.info(f"Joining in-flight {data_class} fetch for {token_address}")
+        return task
+    
+    task = asyncio.create_task(fetch_and_cache_tokenomics(token_address, data_class))
+    _inflight[key] = task
+    task.add_done_callback(lambda _: _inflight.pop(key, None))
+    return task
+
+def _log_refresh_result(task: asyncio.Task) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(f"Background refresh failed: {task.exception()}")
+
+async def _refresh_stale(token_address: str, data_class: str) -> None:
+    """Refresh stale data if no other worker process holds the refresh lock for it"""
+    key = (token_address, data_class)
+    try:
+        # Shared with the background refresher, so stale reads in every worker
+        # still lead to a single upstream call per interval
+        if not await tokenomics_cache.acquire_refresh_lock(
+            token_address, settings.CACHE_REFRESH_INTERVAL_SECONDS, data_class
+        ):
+            logger.info(f"{data_class} data for {token_address} is already being refreshed")
+            return
+        task = _start_fetch(token_address, data_class)
+    finally:
+        _pending_refreshes.discard(key)
+    await task
+
+def schedule_refresh(token_address: str, data_class: str) -> None:
+    """Schedule a background refresh unless one is already running or pending for this data class"""
+    key = (token_address, data_class)
+    if key in _inflight or key in _pending_refreshes:
+        return
+    
+    logger.info(f"Cached {data_class} data for {token_address} is stale, refreshing in background")
+    _pending_refreshes.add(key)
+    asyncio.create_task(_refresh_stale(token_address, data_class)).add_done_callback(_log_refresh_result)
+
+def _merge_parts(
+    parts: Dict[str, Optional[Dict[str, Any]]]
+) -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, str]]:
+    """
+    Merge per data class payloads into Tokenomics field values and metadata.
+    
+    Fields of failed APIs are left out so they keep the Tokenomics fallback defaults.
+    
+    Returns:
+        (field values, cache_info per data class, data_sources)
+    """
+    values = {}
+    cache_info = {}
+    data_sources = {}
+    for data_class, config in DATA_CLASSES.items():
+        data = parts[data_class]
+        if data:
+            values.update({field: data[field] for field in config["fields"] if field in data})
+            if "cache_info" in data:
+                cache_info[data_class] = data["cache_info"]
+            data_sources[config["source"]] = "available"
+        else:
+            data_sources[config["source"]] = "failed"
+    return values, cache_info, data_sources
+
 async def aggregated_tokenomics():
     """
     Aggregate token data from Moralis and Birdeye with enhanced caching and fallback mechanisms.
     
+    Price and supply data are cached with separate TTLs and only the expired ones
+    are fetched again. Stale cached data (past its soft expiration) is served
+    immediately while a background task refreshes it.
+    
     Returns:
         dict with combined fields, using partial data if some APIs fail
     """
     start_time = time.time()
     token_address = settings.TOKEN_ADDRESS
     
-    # Try to get from cache first using the cache manager
+    # Try to get each data class from cache first using the cache manager
     logger.info(f"Checking cache for token: {token_address}")
-    cached_data = tokenomics_cache.get_cached_data(token_address)
-    
-    if cached_data:
-        response_time = time.time() - start_time
-        logger.info(f"Returning cached data in {response_time:.3f}s")
-        
-        # Add response time to cache info
-        cached_data["cache_info"]["response_time"] = response_time
-        return cached_data
-    
-    # Cache miss - fetch from APIs
-    logger.info("Fetching fresh data from APIs")
-    
-    # Fetch from both APIs concurrently with individual error handling
-    moralis_data, birdeye_data = await asyncio.gather(
-        fetch_with_fallback(fetch_token_details, "Moralis"),
-        fetch_with_fallback(fetch_token_stats, "Birdeye"),
-        return_exceptions=True
+    cached = await asyncio.gather(
+        *(tokenomics_cache.get_cached_data(token_address, data_class) for data_class in DATA_CLASSES)
     )
+    parts = {}
+    for data_class, (data, stale) in zip(DATA_CLASSES, cached):
+        parts[data_class] = data
+        if data and stale:
+            schedule_refresh(token_address, data_class)
+    
+    # Cache miss - fetch only the expired data classes, sharing the fetch with concurrent misses.
+    # Shielded so a cancelled request does not cancel the fetch for everyone else.
+    missing = [data_class for data_class, data in parts.items() if not data]
+    if missing:
+        logger.info(f"Fetching fresh {', '.join(missing)} data from APIs")
+        # fetch_and_cache_tokenomics never raises: failed APIs come back as None
+        fetched = await asyncio.gather(
+            *(asyncio.shield(_start_fetch(token_address, data_class)) for data_class in missing)
+        )
+        parts.update(zip(missing, fetched))
+    
+    values, cache_info, data_sources = _merge_parts(parts)
     
-    # Handle exceptions from gather
-    if isinstance(moralis_data, Exception):
-        logger.error(f"Moralis API failed: {moralis_data}")
-        moralis_data = None
-    if isinstance(birdeye_data, Exception):
-        logger.error(f"Birdeye API failed: {birdeye_data}")
-        birdeye_data = None
-    
-    # Build result with available data
-    result = {}
-    
-    # Add Moralis data if available
-    if moralis_data:
-        result.update({
-            "token_name": moralis_data.get("token_name"),
-            "token_symbol": moralis_data.get("token_symbol"),
-            "price_usd": moralis_data.get("price_usd"),
-            "price_change_percentage_24h": moralis_data.get("price_change_percentage_24h"),
-            "volume_24h": moralis_data.get("volume_24h"),
-        })
-    else:
-        # Fallback values for Moralis data
-        result.update({
-            "token_name": "Unknown Token",
-            "token_symbol": "UNKNOWN",
-            "price_usd": 0.0,
-            "price_change_percentage_24h": 0.0,
-            "volume_24h": 0.0,
-        })
-    
-    # Add Birdeye data if available
-    if birdeye_data:
-        result.update({
-            "market_cap": birdeye_data.get("market_cap"),
-            "total_supply": birdeye_data.get("total_supply"),
-            "circulating_supply": birdeye_data.get("circulating_supply"),
-        })
-    else:
-        # Fallback values for Birdeye data
-        result.update({
-            "market_cap": 0.0,
-            "total_supply": 0.0,
-            "circulating_supply": 0.0,
-        })
-    
-    # Add metadata about data sources
-    result["data_sources"] = {
-        "moralis": "available" if moralis_data else "failed",
-        "birdeye": "available" if birdeye_data else "failed"
-    }
-    
-    # Add response time
     response_time = time.time() - start_time
-    result["response_time"] = response_time
-    
-    # Cache the result if we have meaningful data using the cache manager
-    if moralis_data or birdeye_data:
-        logger.info("Caching aggregated data")
-        cache_success = tokenomics_cache.set_cached_data(token_address, result, expiration=300)
-        if not cache_success:
-            logger.warning("Failed to cache data")
-    else:
-        logger.warning("No data available from any API, not caching")
-    
-    return result
+    logger.info(f"Returning aggregated data in {response_time:.3f}s")
+    
+    result = Tokenomics(
+        **values,
+        data_sources=data_sources,
+        cache_info=cache_info,
+        response_time=response_time
+    )
+    return asdict(result)
+
+async def refresh_tokenomics() -> None:
+    """Refresh cached data classes that are stale or missing"""
+    token_address = settings.TOKEN_ADDRESS
+    due = [
+        data_class for data_class in DATA_CLASSES
+        if await tokenomics_cache.is_stale(token_address, data_class)
+    ]
+    
+    # Only one worker process refreshes each data class per interval
+    due = [
+        data_class for data_class in due
+        if await tokenomics_cache.acquire_refresh_lock(
+            token_address, settings.CACHE_REFRESH_INTERVAL_SECONDS, data_class
+        )
+    ]
+    
+    if due:
+        logger.info(f"Refreshing {', '.join(due)} data in background")
+        await asyncio.gather(*(_start_fetch(token_address, data_class) for data_class in due))
+
+async def run_refresher() -> None:
+    """Keep the cache warm so requests are served from Redis instead of waiting on upstream APIs"""
+    logger.info(f"Background refresher started (every {settings.CACHE_REFRESH_INTERVAL_SECONDS}s)")
+    while True:
+        try:
+            await refresh_tokenomics()
+        except Exception as e:
+            logger.error(f"Background refresh failed: {e}")
+        await asyncio.sleep(settings.CACHE_REFRESH_INTERVAL_SECONDS)
 
 async def get_cache_performance():
     """Get comprehensive cache performance metrics"""
     token_address = settings.TOKEN_ADDRESS
-    return tokenomics_cache.get_cache_performance(token_address)
+    return await tokenomics_cache.get_cache_performance(token_address, fields=list(DATA_CLASSES))
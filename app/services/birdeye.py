@@ -1,6 +1,7 @@
-import httpx
 from app.config import settings
+from app.services.http import get_json, retry_upstream
 
+@retry_upstream()
 async def fetch_token_stats():
     """
     Fetch market cap and total supply for a given Solana token from Birdeye API.
@@ -17,18 +18,15 @@ async def fetch_token_stats():
         "x-chain": "solana"    
     }
 
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url, headers=headers)
-        response.raise_for_status()
-        data = response.json()
+    data = await get_json(url, headers=headers)
 
-        if "data" not in data:
-            raise ValueError("Unexpected response from Birdeye API")
+    if "data" not in data:
+        raise ValueError("Unexpected response from Birdeye API")
 
-        token_data = data["data"]
+    token_data = data["data"]
 
-        return {
-            "market_cap": token_data.get("market_cap"),
-            "total_supply": token_data.get("total_supply"),
-            "circulating_supply": token_data.get("circulating_supply"),
-        }
+    return {
+        "market_cap": token_data.get("market_cap"),
+        "total_supply": token_data.get("total_supply"),
+        "circulating_supply": token_data.get("circulating_supply"),
+    }
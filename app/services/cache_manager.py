@@ -1,136 +1,209 @@
-import hashlib
+import asyncio
 import time
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Sequence, Tuple
 from loguru import logger
-from app.services.redis import get_cache, set_cache, get_cache_info
+from app.services.redis import (
+    get_cache_with_stats,
+    set_cache_hash,
+    get_hash_field,
+    acquire_lock,
+    get_hash,
+    get_cache_info,
+)
 from app.config import settings
 
+# How long hit rate results are reused in-process before re-reading Redis
+STATS_CACHE_TTL_SECONDS = 5
+
 class CacheManager:
     """High-level cache management with statistics and performance tracking"""
     
     def __init__(self, namespace: str = "tokenomics"):
         self.namespace = namespace
+        # Static part of the cache metadata, only cached_at changes per write
+        self._cache_info_template = {"source": "api", "namespace": namespace}
+        # Last hit rate result per stats key, as (time.monotonic() timestamp, result)
+        self._hit_rate_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        # Measured lookup time per stats key not yet written to Redis, as (seconds, lookups)
+        self._pending_response_times: Dict[str, Tuple[float, int]] = {}
+    
+    @staticmethod
+    def _with_field(key: str, field: Optional[str]) -> str:
+        """Append an optional sub-identifier ({namespace}:{identifier}:{field})"""
+        return f"{key}:{field}" if field else key
     
-    def get_cache_key(self, identifier: str) -> str:
+    def get_cache_key(self, identifier: str, field: Optional[str] = None) -> str:
         """Generate a cache key with namespace"""
-        return f"{self.namespace}:{hashlib.md5(identifier.encode()).hexdigest()}"
+        return self._with_field(f"{self.namespace}:{identifier}", field)
     
-    def get_stats_key(self, identifier: str) -> str:
+    def get_stats_key(self, identifier: str, field: Optional[str] = None) -> str:
         """Generate a cache statistics key"""
-        return f"{self.namespace}:stats:{hashlib.md5(identifier.encode()).hexdigest()}"
+        return self._with_field(f"{self.namespace}:stats:{identifier}", field)
     
-    def update_cache_stats(self, identifier: str, cache_hit: bool, response_time: float) -> None:
-        """Update cache statistics for monitoring"""
-        try:
-            stats_key = self.get_stats_key(identifier)
-            current_stats = get_cache(stats_key) or {
-                "hits": 0,
-                "misses": 0,
-                "total_requests": 0,
-                "avg_response_time": 0,
-                "last_updated": None
-            }
-            
-            current_stats["total_requests"] += 1
-            if cache_hit:
-                current_stats["hits"] += 1
-            else:
-                current_stats["misses"] += 1
-            
-            # Update average response time
-            total_time = current_stats["avg_response_time"] * (current_stats["total_requests"] - 1) + response_time
-            current_stats["avg_response_time"] = total_time / current_stats["total_requests"]
-            current_stats["last_updated"] = datetime.now().isoformat()
-            
-            # Cache stats for 1 hour
-            set_cache(stats_key, current_stats, expiration=3600)
-            
-        except Exception as e:
-            logger.warning(f"Failed to update cache stats: {e}")
+    def get_lock_key(self, identifier: str, field: Optional[str] = None) -> str:
+        """Generate a refresh lock key"""
+        return self._with_field(f"{self.namespace}:lock:{identifier}", field)
     
-    def get_cache_hit_rate(self, identifier: str) -> Dict[str, Any]:
-        """Get cache hit rate and statistics"""
+    async def get_cache_hit_rate(self, identifier: str, field: Optional[str] = None) -> Dict[str, Any]:
+        """Get cache hit rate and statistics, reusing the last result for STATS_CACHE_TTL_SECONDS"""
+        stats_key = self.get_stats_key(identifier, field)
+        now = time.monotonic()
+        cached = self._hit_rate_cache.get(stats_key)
+        if cached is not None and now - cached[0] < STATS_CACHE_TTL_SECONDS:
+            return cached[1]
+        
         try:
-            stats_key = self.get_stats_key(identifier)
-            stats = get_cache(stats_key)
+            stats = await get_hash(stats_key)
             
             if not stats:
-                return {
+                hit_rate_info = {
                     "hit_rate": 0.0,
                     "total_requests": 0,
                     "hits": 0,
                     "misses": 0,
                     "avg_response_time": 0
                 }
-            
-            total_requests = stats.get("total_requests", 0)
-            hits = stats.get("hits", 0)
-            
-            hit_rate = (hits / total_requests * 100) if total_requests > 0 else 0.0
-            
-            return {
-                "hit_rate": round(hit_rate, 2),
-                "total_requests": total_requests,
-                "hits": hits,
-                "misses": stats.get("misses", 0),
-                "avg_response_time": round(stats.get("avg_response_time", 0), 3),
-                "last_updated": stats.get("last_updated")
-            }
+            else:
+                total_requests = int(stats.get("total_requests", 0))
+                hits = int(stats.get("hits", 0))
+                response_time_sum = float(stats.get("response_time_sum", 0))
+                response_time_samples = int(stats.get("response_time_samples", 0))
+                
+                hit_rate = (hits / total_requests * 100) if total_requests > 0 else 0.0
+                avg_response_time = (
+                    response_time_sum / response_time_samples if response_time_samples > 0 else 0.0
+                )
+                
+                hit_rate_info = {
+                    "hit_rate": round(hit_rate, 2),
+                    "total_requests": total_requests,
+                    "hits": hits,
+                    "misses": int(stats.get("misses", 0)),
+                    "avg_response_time": round(avg_response_time, 3),
+                    "last_updated": stats.get("last_updated")
+                }
         except Exception as e:
             logger.warning(f"Failed to get cache hit rate: {e}")
             return {"error": str(e)}
+        
+        self._hit_rate_cache[stats_key] = (now, hit_rate_info)
+        return hit_rate_info
     
-    def get_cached_data(self, identifier: str) -> Optional[Dict[str, Any]]:
-        """Get cached data with statistics tracking"""
+    async def get_cached_data(
+        self,
+        identifier: str,
+        field: Optional[str] = None
+    ) -> Tuple[Optional[Dict[str, Any]], bool]:
+        """
+        Get cached data with statistics tracking, in a single Redis round trip.
+        
+        A lookup's time is only known after the read, so it is written with the next
+        lookup on the same key together with a sample count; avg_response_time divides
+        by that count, not by total_requests.
+        
+        Returns:
+            (cached data or None, whether the data has passed its soft expiration)
+        """
         start_time = time.time()
-        cache_key = self.get_cache_key(identifier)
+        cache_key = self.get_cache_key(identifier, field)
+        stats_key = self.get_stats_key(identifier, field)
         
-        cached_data = get_cache(cache_key)
+        pending_time, pending_samples = self._pending_response_times.pop(stats_key, (0.0, 0))
+        cached_data, soft_expires_at = await get_cache_with_stats(
+            cache_key,
+            stats_key,
+            # Cache stats for 1 hour
+            stats_expiration=3600,
+            response_time=pending_time,
+            response_time_samples=pending_samples
+        )
         response_time = time.time() - start_time
+        # Concurrent lookups may have queued their own time meanwhile
+        queued_time, queued_samples = self._pending_response_times.get(stats_key, (0.0, 0))
+        self._pending_response_times[stats_key] = (queued_time + response_time, queued_samples + 1)
         
         if cached_data:
-            logger.info(f"Cache HIT for {identifier} in {response_time:.3f}s")
-            self.update_cache_stats(identifier, cache_hit=True, response_time=response_time)
-        else:
-            logger.info(f"Cache MISS for {identifier} in {response_time:.3f}s")
-            self.update_cache_stats(identifier, cache_hit=False, response_time=response_time)
+            logger.info(f"Cache HIT for {cache_key} in {response_time:.3f}s")
+            return cached_data, soft_expires_at is None or time.time() >= soft_expires_at
         
-        return cached_data
+        logger.info(f"Cache MISS for {cache_key} in {response_time:.3f}s")
+        return None, True
     
-    def set_cached_data(self, identifier: str, data: Dict[str, Any], expiration: Optional[int] = None) -> bool:
-        """Set cached data with metadata"""
-        cache_key = self.get_cache_key(identifier)
+    async def is_stale(self, identifier: str, field: Optional[str] = None) -> bool:
+        """Check whether cached data is missing or has passed its soft expiration and should be refreshed"""
+        soft_expires_at = await get_hash_field(self.get_cache_key(identifier, field), "soft_expires_at")
+        return soft_expires_at is None or time.time() >= float(soft_expires_at)
+    
+    async def acquire_refresh_lock(self, identifier: str, expiration: int, field: Optional[str] = None) -> bool:
+        """Claim the right to refresh cached data so only one worker process does it"""
+        return await acquire_lock(self.get_lock_key(identifier, field), expiration)
+    
+    async def set_cached_data(
+        self,
+        identifier: str,
+        data: Dict[str, Any],
+        expiration: Optional[int] = None,
+        soft_expiration: Optional[int] = None,
+        field: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Set cached data with metadata and an optional soft expiration.
+        
+        Data and soft expiration are stored in one hash ({namespace}:{identifier}:{field})
+        so reads need a single round trip. The input dict is not modified; the cached
+        payload is a copy with cache_info added.
+        
+        Returns:
+            The cached payload, or None if caching failed
+        """
+        cache_key = self.get_cache_key(identifier, field)
         
         # Add cache metadata
-        data["cache_info"] = {
-            "source": "api",
-            "cached_at": datetime.now().isoformat(),
-            "namespace": self.namespace
-        }
+        cached_at = datetime.now().isoformat()
+        payload = {**data, "cache_info": {**self._cache_info_template, "cached_at": cached_at}}
         
-        success = set_cache(cache_key, data, expiration=expiration)
+        if expiration is None:
+            expiration = settings.CACHE_EXPIRATION_SECONDS
+        soft_expires_at = time.time() + (soft_expiration if soft_expiration is not None else expiration)
+        
+        success = await set_cache_hash(
+            cache_key, payload, fields={"soft_expires_at": soft_expires_at}, expiration=expiration
+        )
         if success:
-            logger.info(f"Successfully cached data for {identifier}")
-        else:
-            logger.warning(f"Failed to cache data for {identifier}")
+            logger.info(f"Successfully cached data for {cache_key}")
+            return payload
         
-        return success
+        logger.warning(f"Failed to cache data for {cache_key}")
+        return None
     
-    def get_cache_performance(self, identifier: str) -> Dict[str, Any]:
-        """Get comprehensive cache performance metrics"""
+    async def get_cache_performance(
+        self,
+        identifier: str,
+        fields: Optional[Sequence[str]] = None
+    ) -> Dict[str, Any]:
+        """Get comprehensive cache performance metrics, per field when fields are given"""
         try:
-            # Get Redis server info
-            redis_info = get_cache_info()
-            
-            # Get cache hit rate
-            hit_rate_info = self.get_cache_hit_rate(identifier)
+            # Get Redis server info and cache hit rates concurrently
+            if fields:
+                redis_info, *hit_rates = await asyncio.gather(
+                    get_cache_info(),
+                    *(self.get_cache_hit_rate(identifier, field) for field in fields)
+                )
+                hit_rate_info = dict(zip(fields, hit_rates))
+                cache_key = {field: self.get_cache_key(identifier, field) for field in fields}
+            else:
+                redis_info, hit_rate_info = await asyncio.gather(
+                    get_cache_info(),
+                    self.get_cache_hit_rate(identifier)
+                )
+                cache_key = self.get_cache_key(identifier)
             
             return {
                 "redis_server": redis_info,
                 "cache_performance": hit_rate_info,
                 "identifier": identifier,
-                "cache_key": self.get_cache_key(identifier),
+                "cache_key": cache_key,
                 "namespace": self.namespace
             }
         except Exception as e:
@@ -0,0 +1,128 @@
+import asyncio
+import functools
+import random
+import httpx
+from loguru import logger
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# Upstream status codes worth retrying (rate limiting and transient server errors)
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Shared HTTP client, created on application startup and reused for all upstream calls
+_client: Optional[httpx.AsyncClient] = None
+
+# Last ETag and parsed body per URL, for conditional requests
+_etag_cache: Dict[str, Tuple[str, Any]] = {}
+
+def _create_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(5.0, connect=2.0),
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        http2=True,
+    )
+
+async def init_http_client() -> httpx.AsyncClient:
+    """
+    Create the shared HTTP client.
+
+    Returns:
+        The shared httpx.AsyncClient instance
+    """
+    client = get_http_client()
+    logger.info("Shared HTTP client initialized")
+    return client
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Get the shared HTTP client, creating it lazily when used outside the app lifecycle.
+
+    Returns:
+        The shared httpx.AsyncClient instance
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = _create_client()
+    return _client
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client and release its connections"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+        logger.info("Shared HTTP client closed")
+
+async def get_json(url: str, headers: Dict[str, str]) -> Any:
+    """
+    GET a JSON resource with the shared client, using ETags when the upstream supports them.
+    
+    The ETag and parsed body of the last response are kept per URL and sent back as
+    If-None-Match; on 304 Not Modified the stored body is returned without parsing.
+    Upstreams that ignore the header simply return 200 every time.
+    
+    Args:
+        url: Resource URL
+        headers: Request headers
+        
+    Returns:
+        Parsed JSON body
+    """
+    cached = _etag_cache.get(url)
+    if cached is not None:
+        headers = {**headers, "If-None-Match": cached[0]}
+    
+    response = await get_http_client().get(url, headers=headers)
+    if response.status_code == 304 and cached is not None:
+        logger.info(f"Not modified, reusing cached response for {url}")
+        return cached[1]
+    
+    response.raise_for_status()
+    data = response.json()
+    
+    etag = response.headers.get("etag")
+    if etag:
+        _etag_cache[url] = (etag, data)
+    else:
+        _etag_cache.pop(url, None)
+    return data
+
+def _is_retryable(error: Exception) -> bool:
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code in RETRYABLE_STATUS_CODES
+    return isinstance(error, httpx.TransportError)
+
+def retry_upstream(
+    attempts: int = 4,
+    initial_delay: float = 0.2,
+    max_delay: float = 5.0
+) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
+    """
+    Retry an async upstream call with exponential backoff and jitter.
+    
+    Only 429/5xx responses and transport errors are retried; anything else is raised immediately.
+    
+    Args:
+        attempts: Maximum number of attempts, including the first call
+        initial_delay: Base delay in seconds before the first retry
+        max_delay: Upper bound for the exponential part of the delay
+    """
+    def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> T:
+            attempt = 1
+            while True:
+                try:
+                    return await func(*args, **kwargs)
+                except httpx.HTTPError as e:
+                    if attempt >= attempts or not _is_retryable(e):
+                        raise
+                    delay = min(max_delay, initial_delay * 2 ** (attempt - 1)) + random.uniform(0, initial_delay)
+                    logger.warning(
+                        f"{func.__name__} failed (attempt {attempt}/{attempts}): {e}, retrying in {delay:.2f}s"
+                    )
+                    await asyncio.sleep(delay)
+                    attempt += 1
+        return wrapper
+    return decorator
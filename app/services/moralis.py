@@ -1,8 +1,9 @@
-import httpx
 from app.config import settings
+from app.services.http import get_json, retry_upstream
 from app.utils.format import to_fixed_str
 
 
+@retry_upstream()
 async def fetch_token_details():
     """Fetch token details (price, name, symbol, etc.) from Moralis Solana API"""
 
@@ -12,10 +13,7 @@ async def fetch_token_details():
         "X-API-Key": settings.MORALIS_API_KEY,
     }
 
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url, headers=headers)
-        response.raise_for_status()
-        data = response.json()
+    data = await get_json(url, headers=headers)
 
     # Map API response to schema format
     return {
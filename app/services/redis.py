@@ -1,34 +1,100 @@
+import time
+from datetime import datetime
 import redis
-import json
+import redis.asyncio as aioredis
+import orjson
+import zstandard
 from app.config import settings
 from loguru import logger
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 
-# Redis client with error handling
+# Cached values larger than this are zstd-compressed; smaller ones would only grow
+COMPRESSION_MIN_BYTES = 128
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+_compressor = zstandard.ZstdCompressor(level=1)
+_decompressor = zstandard.ZstdDecompressor()
+
+# Last Redis INFO summary, as (time.monotonic() timestamp, result)
+CACHE_INFO_TTL_SECONDS = 5
+_cache_info_snapshot: Optional[Tuple[float, Dict[str, Any]]] = None
+
+# Async Redis client backed by a connection pool, with error handling
 try:
-    r = redis.Redis(
+    pool = aioredis.ConnectionPool(
         host=settings.REDIS_HOST, 
         port=settings.REDIS_PORT, 
         db=0,  # Default Redis database
-        decode_responses=True,
+        decode_responses=False,  # Work with raw bytes, orjson parses them directly
         socket_connect_timeout=5,  # 5 second connection timeout
         socket_timeout=5,          # 5 second operation timeout
         retry_on_timeout=True,
-        health_check_interval=30
+        health_check_interval=30,
+        max_connections=50
     )
-    
-    # Test the connection
-    r.ping()
-    logger.info(f"Redis connected successfully to {settings.REDIS_HOST}:{settings.REDIS_PORT}")
-    
-except redis.ConnectionError as e:
-    logger.error(f"Failed to connect to Redis: {e}")
-    r = None
+    r = aioredis.Redis(connection_pool=pool)
 except Exception as e:
     logger.error(f"Redis initialization error: {e}")
     r = None
 
-def get_cache(key: str) -> Optional[Dict[str, Any]]:
+# Read a cached payload hash and record the lookup in its stats hash atomically, in one round trip.
+# KEYS: payload hash, stats hash.
+# ARGV: stats expiration, last_updated, response time to add, number of lookups it covers.
+GET_WITH_STATS_LUA = """
+local values = redis.call('HMGET', KEYS[1], 'data', 'soft_expires_at')
+redis.call('HINCRBY', KEYS[2], 'total_requests', 1)
+redis.call('HINCRBY', KEYS[2], values[1] and 'hits' or 'misses', 1)
+redis.call('HINCRBYFLOAT', KEYS[2], 'response_time_sum', ARGV[3])
+redis.call('HINCRBY', KEYS[2], 'response_time_samples', ARGV[4])
+redis.call('HSET', KEYS[2], 'last_updated', ARGV[2])
+redis.call('EXPIRE', KEYS[2], ARGV[1])
+return values
+"""
+_get_with_stats = r.register_script(GET_WITH_STATS_LUA) if r is not None else None
+
+def encode_value(value: Any) -> bytes:
+    """Serialize a value to JSON, zstd-compressing it when large enough to benefit"""
+    blob = orjson.dumps(value, default=str)
+    if len(blob) >= COMPRESSION_MIN_BYTES:
+        return _compressor.compress(blob)
+    return blob
+
+def decode_value(blob: bytes) -> Any:
+    """Deserialize a cached value, decompressing it if it starts with the zstd frame magic"""
+    if blob.startswith(ZSTD_MAGIC):
+        blob = _decompressor.decompress(blob)
+    return orjson.loads(blob)
+
+async def init_redis() -> bool:
+    """
+    Test the Redis connection.
+    
+    Returns:
+        True if Redis is reachable, False otherwise
+    """
+    if r is None:
+        logger.warning("Redis not available, skipping connection check")
+        return False
+    
+    try:
+        await r.ping()
+        logger.info(f"Redis connected successfully to {settings.REDIS_HOST}:{settings.REDIS_PORT}")
+        return True
+    except redis.ConnectionError as e:
+        logger.error(f"Failed to connect to Redis: {e}")
+        return False
+    except Exception as e:
+        logger.error(f"Redis connection check error: {e}")
+        return False
+
+async def close_redis() -> None:
+    """Close the Redis client and disconnect its connection pool"""
+    if r is not None:
+        # The pool is passed in explicitly, so the client doesn't close it on its own
+        await r.aclose(close_connection_pool=True)
+        logger.info("Redis connection pool closed")
+
+async def get_cache(key: str) -> Optional[Dict[str, Any]]:
     """
     Get data from Redis cache.
     
@@ -43,14 +109,14 @@ def get_cache(key: str) -> Optional[Dict[str, Any]]:
         return None
     
     try:
-        value = r.get(key)
+        value = await r.get(key)
         if value:
             logger.info(f"Cache hit for key: {key}")
-            return json.loads(value)
+            return decode_value(value)
         else:
             logger.info(f"Cache miss for key: {key}")
             return None
-    except json.JSONDecodeError as e:
+    except (orjson.JSONDecodeError, zstandard.ZstdError) as e:
         logger.error(f"Failed to decode cached JSON for key {key}: {e}")
         return None
     except redis.RedisError as e:
@@ -60,7 +126,31 @@ def get_cache(key: str) -> Optional[Dict[str, Any]]:
         logger.error(f"Unexpected error while getting cache for key {key}: {e}")
         return None
 
-def set_cache(key: str, value: Dict[str, Any], expiration: Optional[int] = None) -> bool:
+async def acquire_lock(key: str, expiration: int) -> bool:
+    """
+    Acquire a short-lived lock shared by all worker processes (SET NX EX).
+    
+    Args:
+        key: Lock key
+        expiration: Lock lifetime in seconds
+        
+    Returns:
+        True if the lock was acquired, False if already held or Redis unavailable
+    """
+    if r is None:
+        logger.warning("Redis not available, cannot acquire lock")
+        return False
+    
+    try:
+        return bool(await r.set(key, b"1", nx=True, ex=expiration))
+    except redis.RedisError as e:
+        logger.error(f"Redis error while acquiring lock {key}: {e}")
+        return False
+    except Exception as e:
+        logger.error(f"Unexpected error while acquiring lock {key}: {e}")
+        return False
+
+async def set_cache(key: str, value: Dict[str, Any], expiration: Optional[int] = None) -> bool:
     """
     Set data in Redis cache.
     
@@ -80,11 +170,98 @@ def set_cache(key: str, value: Dict[str, Any], expiration: Optional[int] = None)
         expiration = settings.CACHE_EXPIRATION_SECONDS
     
     try:
-        json_value = json.dumps(value)
-        r.setex(key, expiration, json_value)
+        await r.setex(key, expiration, encode_value(value))
+        logger.info(f"Cached data for key: {key} (expires in {expiration}s)")
+        return True
+    except orjson.JSONEncodeError as e:
+        logger.error(f"Failed to encode data to JSON for key {key}: {e}")
+        return False
+    except redis.RedisError as e:
+        logger.error(f"Redis error while setting cache for key {key}: {e}")
+        return False
+    except Exception as e:
+        logger.error(f"Unexpected error while setting cache for key {key}: {e}")
+        return False
+
+async def get_cache_with_stats(
+    key: str,
+    stats_key: str,
+    stats_expiration: int,
+    response_time: float = 0.0,
+    response_time_samples: int = 0
+) -> Tuple[Optional[Dict[str, Any]], Optional[float]]:
+    """
+    Get a cached payload hash and update its statistics hash in a single round trip.
+    
+    Args:
+        key: Payload hash key (fields: data, soft_expires_at)
+        stats_key: Statistics hash key
+        stats_expiration: Expiration time of the statistics hash in seconds
+        response_time: Lookup time in seconds to add to response_time_sum
+        response_time_samples: Number of lookups response_time covers
+        
+    Returns:
+        (cached data, soft expiration timestamp), both None if not found or Redis unavailable
+    """
+    if r is None or _get_with_stats is None:
+        logger.warning("Redis not available, cannot get cache")
+        return None, None
+    
+    try:
+        value, soft_expires_at = await _get_with_stats(
+            keys=[key, stats_key],
+            args=[stats_expiration, datetime.now().isoformat(), response_time, response_time_samples]
+        )
+        if value:
+            logger.info(f"Cache hit for key: {key}")
+            return decode_value(value), float(soft_expires_at) if soft_expires_at else None
+        else:
+            logger.info(f"Cache miss for key: {key}")
+            return None, None
+    except (orjson.JSONDecodeError, zstandard.ZstdError) as e:
+        logger.error(f"Failed to decode cached JSON for key {key}: {e}")
+        return None, None
+    except redis.RedisError as e:
+        logger.error(f"Redis error while getting cache for key {key}: {e}")
+        return None, None
+    except Exception as e:
+        logger.error(f"Unexpected error while getting cache for key {key}: {e}")
+        return None, None
+
+async def set_cache_hash(
+    key: str,
+    value: Dict[str, Any],
+    fields: Optional[Dict[str, Any]] = None,
+    expiration: Optional[int] = None
+) -> bool:
+    """
+    Set data in a Redis cache hash, replacing any previous hash under the key.
+    
+    Args:
+        key: Hash key
+        value: Data to cache, stored in the "data" field
+        fields: Additional fields to store alongside the data
+        expiration: Expiration time in seconds for the whole hash (default from settings)
+        
+    Returns:
+        True if successful, False otherwise
+    """
+    if r is None:
+        logger.warning("Redis not available, cannot set cache")
+        return False
+    
+    if expiration is None:
+        expiration = settings.CACHE_EXPIRATION_SECONDS
+    
+    try:
+        pipe = r.pipeline(transaction=True)
+        pipe.delete(key)
+        pipe.hset(key, mapping={"data": encode_value(value), **(fields or {})})
+        pipe.expire(key, expiration)
+        await pipe.execute()
         logger.info(f"Cached data for key: {key} (expires in {expiration}s)")
         return True
-    except json.JSONEncodeError as e:
+    except orjson.JSONEncodeError as e:
         logger.error(f"Failed to encode data to JSON for key {key}: {e}")
         return False
     except redis.RedisError as e:
@@ -94,7 +271,56 @@ def set_cache(key: str, value: Dict[str, Any], expiration: Optional[int] = None)
         logger.error(f"Unexpected error while setting cache for key {key}: {e}")
         return False
 
-def delete_cache(key: str) -> bool:
+async def get_hash_field(key: str, field: str) -> Optional[str]:
+    """
+    Get a single field of a Redis hash.
+    
+    Args:
+        key: Hash key
+        field: Field name
+        
+    Returns:
+        Field value, or None if not found or Redis unavailable
+    """
+    if r is None:
+        logger.warning("Redis not available, cannot get hash field")
+        return None
+    
+    try:
+        value = await r.hget(key, field)
+        return value.decode() if value is not None else None
+    except redis.RedisError as e:
+        logger.error(f"Redis error while getting hash field {field} for key {key}: {e}")
+        return None
+    except Exception as e:
+        logger.error(f"Unexpected error while getting hash field {field} for key {key}: {e}")
+        return None
+
+async def get_hash(key: str) -> Dict[str, str]:
+    """
+    Get all fields of a Redis hash.
+    
+    Args:
+        key: Hash key
+        
+    Returns:
+        Hash fields, empty if not found or Redis unavailable
+    """
+    if r is None:
+        logger.warning("Redis not available, cannot get hash")
+        return {}
+    
+    try:
+        values = await r.hgetall(key)
+        return {field.decode(): value.decode() for field, value in values.items()}
+    except redis.RedisError as e:
+        logger.error(f"Redis error while getting hash for key {key}: {e}")
+        return {}
+    except Exception as e:
+        logger.error(f"Unexpected error while getting hash for key {key}: {e}")
+        return {}
+
+async def delete_cache(key: str) -> bool:
     """
     Delete data from Redis cache.
     
@@ -109,7 +335,7 @@ def delete_cache(key: str) -> bool:
         return False
     
     try:
-        result = r.delete(key)
+        result = await r.delete(key)
         if result > 0:
             logger.info(f"Deleted cache for key: {key}")
         else:
@@ -122,7 +348,7 @@ def delete_cache(key: str) -> bool:
         logger.error(f"Unexpected error while deleting cache for key {key}: {e}")
         return False
 
-def clear_all_cache() -> bool:
+async def clear_all_cache() -> bool:
     """
     Clear all cached data.
     
@@ -134,7 +360,7 @@ def clear_all_cache() -> bool:
         return False
     
     try:
-        r.flushdb()
+        await r.flushdb()
         logger.info("Cleared all cached data")
         return True
     except redis.RedisError as e:
@@ -144,22 +370,31 @@ def clear_all_cache() -> bool:
         logger.error(f"Unexpected error while clearing cache: {e}")
         return False
 
-def get_cache_info() -> Dict[str, Any]:
+async def get_cache_info() -> Dict[str, Any]:
     """
     Get information about the cache status.
     
+    The Redis INFO result is reused for CACHE_INFO_TTL_SECONDS so monitoring
+    endpoints don't hit Redis on every call.
+    
     Returns:
         Dictionary with cache information
     """
+    global _cache_info_snapshot
+    
     if r is None:
         return {
             "status": "unavailable",
             "message": "Redis connection failed"
         }
     
+    now = time.monotonic()
+    if _cache_info_snapshot is not None and now - _cache_info_snapshot[0] < CACHE_INFO_TTL_SECONDS:
+        return _cache_info_snapshot[1]
+    
     try:
-        info = r.info()
-        return {
+        info = await r.info()
+        cache_info = {
             "status": "available",
             "host": settings.REDIS_HOST,
             "port": settings.REDIS_PORT,
@@ -168,6 +403,8 @@ def get_cache_info() -> Dict[str, Any]:
             "keyspace_hits": info.get("keyspace_hits", 0),
             "keyspace_misses": info.get("keyspace_misses", 0)
         }
+        _cache_info_snapshot = (now, cache_info)
+        return cache_info
     except Exception as e:
         logger.error(f"Failed to get Redis info: {e}")
         return {
@@ -23,7 +23,7 @@ async def test_caching_behavior():
     
     # Check Redis status
     print("1. Checking Redis status...")
-    redis_info = get_cache_info()
+    redis_info = await get_cache_info()
     if redis_info.get("status") != "available":
         print("   ❌ Redis is not available!")
         print("   Please start Redis: docker run -d --name redis -p 6379:6379 redis")
@@ -34,7 +34,7 @@ async def test_caching_behavior():
     
     # Clear any existing cache
     print("\n2. Clearing existing cache...")
-    clear_all_cache()
+    await clear_all_cache()
     print("   ✅ Cache cleared")
     
     # First request - should be a cache miss
@@ -44,7 +44,7 @@ async def test_caching_behavior():
     response_time1 = time.time() - start_time
     
     print(f"   Response time: {response_time1:.3f}s")
-    print(f"   Data source: {data1.get('cache_info', {}).get('source', 'unknown')}")
+    print(f"   Data source: {data1.get('cache_info', {}).get('price', {}).get('source', 'unknown')}")
     print(f"   Token name: {data1.get('token_name', 'N/A')}")
     print(f"   Price: ${data1.get('price_usd', 'N/A')}")
     
@@ -55,7 +55,7 @@ async def test_caching_behavior():
     response_time2 = time.time() - start_time
     
     print(f"   Response time: {response_time2:.3f}s")
-    print(f"   Data source: {data2.get('cache_info', {}).get('source', 'unknown')}")
+    print(f"   Data source: {data2.get('cache_info', {}).get('price', {}).get('source', 'unknown')}")
     print(f"   Token name: {data2.get('token_name', 'N/A')}")
     print(f"   Price: ${data2.get('price_usd', 'N/A')}")
     
@@ -67,8 +67,8 @@ async def test_caching_behavior():
     print("\n5. Cache performance metrics...")
     performance = await get_cache_performance()
     
-    cache_stats = performance.get("cache_performance", {})
-    print(f"   Hit rate: {cache_stats.get('hit_rate', 0)}%")
+    cache_stats = performance.get("cache_performance", {}).get("price", {})
+    print(f"   Price hit rate: {cache_stats.get('hit_rate', 0)}%")
     print(f"   Total requests: {cache_stats.get('total_requests', 0)}")
     print(f"   Hits: {cache_stats.get('hits', 0)}")
     print(f"   Misses: {cache_stats.get('misses', 0)}")
@@ -105,7 +105,7 @@ async def demonstrate_cache_benefits():
         data = await aggregated_tokenomics()
         request_time = time.time() - request_start
         
-        source = data.get('cache_info', {}).get('source', 'unknown')
+        source = data.get('cache_info', {}).get('price', {}).get('source', 'unknown')
         print(f"   Request {i+1}: {request_time:.3f}s ({source})")
     
     total_time = time.time() - start_time
@@ -118,8 +118,8 @@ async def demonstrate_cache_benefits():
     
     # Get final performance stats
     performance = await get_cache_performance()
-    cache_stats = performance.get("cache_performance", {})
-    print(f"   Final hit rate: {cache_stats.get('hit_rate', 0)}%")
+    cache_stats = performance.get("cache_performance", {}).get("price", {})
+    print(f"   Final price hit rate: {cache_stats.get('hit_rate', 0)}%")
 
 if __name__ == "__main__":
     try:
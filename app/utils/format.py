@@ -1,10 +1,15 @@
 from decimal import Decimal, ROUND_HALF_UP
 
 
-def to_fixed_str(value: float | None, decimals: int = 8) -> str | None:
-    """Convert float/scientific notation to fixed decimal string."""
+def to_fixed_str(value: float | None, decimals: int = 8, exact: bool = False) -> str | None:
+    """
+    Convert float/scientific notation to fixed decimal string.
+    Set exact=True for Decimal ROUND_HALF_UP rounding instead of float formatting.
+    """
     if value is None:
         return None
+    if not exact:
+        return f"{float(value):.{decimals}f}"
     q = Decimal('1.' + '0' * decimals)  # quantization step
     return str(Decimal(str(value)).quantize(q, rounding=ROUND_HALF_UP))
 
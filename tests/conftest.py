@@ -0,0 +1,13 @@
+import fakeredis
+import pytest
+
+from app.services import redis as redis_service
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    """Point the Redis helpers, including the lookup Lua script, at an in-memory fake"""
+    client = fakeredis.aioredis.FakeRedis()
+    monkeypatch.setattr(redis_service, "r", client)
+    monkeypatch.setattr(redis_service, "_get_with_stats", client.register_script(redis_service.GET_WITH_STATS_LUA))
+    return client
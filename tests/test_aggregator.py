@@ -0,0 +1,48 @@
+import asyncio
+
+import pytest
+
+from app.config import settings
+from app.services import aggregator
+from app.services.cache_manager import tokenomics_cache
+
+TOKEN = "TOKEN"
+
+
+@pytest.fixture
+def upstream_calls(monkeypatch, fake_redis):
+    """Replace the price API with a counter and return the list of calls"""
+    calls = []
+
+    async def fetch_price():
+        calls.append(1)
+        return {"token_name": "Test", "price_usd": 1.5}
+
+    monkeypatch.setitem(aggregator.DATA_CLASSES["price"], "api_func", fetch_price)
+    return calls
+
+
+async def _drain_refreshes():
+    while aggregator._pending_refreshes or aggregator._inflight:
+        await asyncio.sleep(0)
+
+
+async def test_stale_refresh_fetches_once_per_worker(upstream_calls):
+    aggregator.schedule_refresh(TOKEN, "price")
+    aggregator.schedule_refresh(TOKEN, "price")
+    await _drain_refreshes()
+
+    assert len(upstream_calls) == 1
+    data, stale = await tokenomics_cache.get_cached_data(TOKEN, "price")
+    assert data["price_usd"] == 1.5
+    assert stale is False
+
+
+async def test_stale_refresh_skipped_while_another_worker_holds_lock(upstream_calls):
+    # Lock taken by another worker process (or the background refresher)
+    assert await tokenomics_cache.acquire_refresh_lock(TOKEN, settings.CACHE_REFRESH_INTERVAL_SECONDS, "price")
+
+    aggregator.schedule_refresh(TOKEN, "price")
+    await _drain_refreshes()
+
+    assert upstream_calls == []
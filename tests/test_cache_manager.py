@@ -0,0 +1,54 @@
+from app.services.cache_manager import CacheManager
+
+DATA = {"token_name": "Test", "price_usd": 1.5}
+
+
+async def test_miss_then_hit_updates_stats(fake_redis):
+    manager = CacheManager()
+
+    assert await manager.get_cached_data("TOKEN", "price") == (None, True)
+
+    await manager.set_cached_data("TOKEN", DATA, expiration=30, soft_expiration=20, field="price")
+    data, stale = await manager.get_cached_data("TOKEN", "price")
+    assert data["price_usd"] == 1.5
+    assert data["cache_info"]["namespace"] == "tokenomics"
+    assert stale is False
+    await manager.get_cached_data("TOKEN", "price")
+
+    stats = await manager.get_cache_hit_rate("TOKEN", "price")
+    assert stats["total_requests"] == 3
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == 66.67
+    # Each lookup's time is written with the next one, so two of the three are recorded
+    recorded = await fake_redis.hgetall(manager.get_stats_key("TOKEN", "price"))
+    assert int(recorded[b"response_time_samples"]) == 2
+    assert stats["avg_response_time"] == round(float(recorded[b"response_time_sum"]) / 2, 3)
+    assert 0 <= stats["avg_response_time"] < 1
+    assert stats["last_updated"]
+    assert 0 < await fake_redis.ttl(manager.get_stats_key("TOKEN", "price")) <= 3600
+
+
+async def test_past_soft_expiration_is_stale(fake_redis):
+    manager = CacheManager()
+    await manager.set_cached_data("TOKEN", DATA, expiration=30, soft_expiration=20, field="price")
+    cache_key = manager.get_cache_key("TOKEN", "price")
+
+    assert 0 < await fake_redis.ttl(cache_key) <= 30
+    assert await manager.is_stale("TOKEN", "price") is False
+
+    await fake_redis.hset(cache_key, "soft_expires_at", 0)
+    data, stale = await manager.get_cached_data("TOKEN", "price")
+    assert data["token_name"] == "Test"
+    assert stale is True
+    assert await manager.is_stale("TOKEN", "price") is True
+
+
+async def test_missing_entry_is_stale(fake_redis):
+    assert await CacheManager().is_stale("TOKEN", "supply") is True
+
+
+async def test_hit_rate_without_stats(fake_redis):
+    stats = await CacheManager().get_cache_hit_rate("TOKEN", "price")
+    assert stats["total_requests"] == 0
+    assert stats["avg_response_time"] == 0
@@ -0,0 +1,18 @@
+from app.config import get_settings, settings
+
+
+def test_settings_proxy_reads_through_get_settings(monkeypatch):
+    monkeypatch.setenv("TOKEN_ADDRESS", "first")
+    get_settings.cache_clear()
+    try:
+        assert settings.TOKEN_ADDRESS == "first"
+        assert get_settings() is get_settings()
+
+        monkeypatch.setenv("TOKEN_ADDRESS", "second")
+        assert settings.TOKEN_ADDRESS == "first"
+
+        get_settings.cache_clear()
+        assert settings.TOKEN_ADDRESS == "second"
+    finally:
+        get_settings.cache_clear()
+
@@ -0,0 +1,108 @@
+import httpx
+import pytest
+
+from app.services import http
+from app.services.http import get_json, retry_upstream
+
+URL = "https://upstream.test/resource"
+
+
+@pytest.fixture
+def mock_upstream(monkeypatch):
+    """Route the shared HTTP client through a list of canned responses"""
+    responses = []
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return responses.pop(0)
+
+    monkeypatch.setattr(http, "_client", httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    monkeypatch.setattr(http, "_etag_cache", {})
+    return responses, requests
+
+
+@retry_upstream(initial_delay=0, max_delay=0)
+async def fetch():
+    return await get_json(URL, headers={})
+
+
+@pytest.mark.parametrize("status", sorted(http.RETRYABLE_STATUS_CODES))
+async def test_retries_retryable_status_then_succeeds(mock_upstream, status):
+    responses, requests = mock_upstream
+    responses += [httpx.Response(status), httpx.Response(200, json={"ok": True})]
+
+    assert await fetch() == {"ok": True}
+    assert len(requests) == 2
+
+
+async def test_does_not_retry_client_errors(mock_upstream):
+    responses, requests = mock_upstream
+    responses += [httpx.Response(404), httpx.Response(200, json={})]
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await fetch()
+    assert len(requests) == 1
+
+
+async def test_gives_up_after_max_attempts(mock_upstream):
+    responses, requests = mock_upstream
+    responses += [httpx.Response(503) for _ in range(5)]
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await fetch()
+    assert len(requests) == 4
+
+
+async def test_retries_transport_errors():
+    calls = []
+
+    @retry_upstream(initial_delay=0, max_delay=0)
+    async def flaky():
+        calls.append(1)
+        if len(calls) == 1:
+            raise httpx.ConnectError("connection refused")
+        return "ok"
+
+    assert await flaky() == "ok"
+    assert len(calls) == 2
+
+
+async def test_does_not_retry_value_error():
+    calls = []
+
+    @retry_upstream(initial_delay=0, max_delay=0)
+    async def bad_payload():
+        calls.append(1)
+        raise ValueError("Unexpected response")
+
+    with pytest.raises(ValueError):
+        await bad_payload()
+    assert len(calls) == 1
+
+
+async def test_etag_304_reuses_cached_body(mock_upstream):
+    responses, requests = mock_upstream
+    responses += [
+        httpx.Response(200, json={"price": 1}, headers={"ETag": '"v1"'}),
+        httpx.Response(304),
+    ]
+
+    first = await get_json(URL, headers={"accept": "application/json"})
+    second = await get_json(URL, headers={"accept": "application/json"})
+
+    assert first == second == {"price": 1}
+    assert "if-none-match" not in requests[0].headers
+    assert requests[1].headers["if-none-match"] == '"v1"'
+
+
+async def test_no_etag_sends_no_conditional_header(mock_upstream):
+    responses, requests = mock_upstream
+    responses += [
+        httpx.Response(200, json={"price": 1}),
+        httpx.Response(200, json={"price": 2}),
+    ]
+
+    assert await get_json(URL, headers={}) == {"price": 1}
+    assert await get_json(URL, headers={}) == {"price": 2}
+    assert "if-none-match" not in requests[1].headers